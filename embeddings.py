@@ -5,6 +5,11 @@ Embedding model loader for RAG.
 Supports HuggingFace, OpenAI, and Instructor models.
 """
 
+import threading
+from collections import OrderedDict
+from typing import List
+
+from langchain_core.embeddings import Embeddings
 from langchain_community.embeddings import OpenAIEmbeddings, HuggingFaceInstructEmbeddings
 from langchain_huggingface import HuggingFaceEmbeddings
 
@@ -28,3 +33,42 @@ def get_embedding_model(method: str):
 
     else:
         raise ValueError(f"Unsupported embedding method: {method}")
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    CachedQueryEmbeddings
+    ---------------------
+    Wraps an embedding model with an LRU cache for embed_query().
+    Repeated questions skip the model; embed_documents() is passed through.
+    """
+
+    def __init__(self, base: Embeddings, maxsize: int = 256):
+        self.base = base
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return vector
+            self.misses += 1
+
+        vector = self.base.embed_query(text)
+
+        if self.maxsize > 0:
+            with self._lock:
+                self._cache[text] = vector
+                self._cache.move_to_end(text)
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        return vector
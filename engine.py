@@ -5,15 +5,16 @@ Core RAG Engine orchestration.
 Handles: chunking → embeddings → vectorstore → retrieval → rerank → memory → LLM query.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from langchain_core.messages import HumanMessage, AIMessage
 from memory_manager import MemoryManager
 from chunking import get_chunker
-from embeddings import get_embedding_model
+from embeddings import get_embedding_model, CachedQueryEmbeddings
 from vectorstore import build_vectorstore
-from retriever import get_retriever
+from retriever import get_retriever, get_search_overrides
 from llm_loader import get_llm
 from reranker import apply_reranker
+from kb_registry import KnowledgeBaseRegistry, make_kb_key, shared_kb_registry
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -27,32 +28,80 @@ class RAGEngine:
     Modular, pluggable RAG pipeline.
     """
 
-    def __init__(self, config: Dict[str, Any]):
-        self.config = {"max_history_turns": 6, **config}
+    def __init__(self, config: Dict[str, Any], kb_registry: KnowledgeBaseRegistry = shared_kb_registry):
+        self.config = {"max_history_turns": 6, "query_embedding_cache_size": 256, **config}
         self.vectorstore = None
+        self.kb_registry = kb_registry
+        self.kb_key = None
+        # Configured retrievers keyed by (kb_key, retrieval method)
+        self._retrievers: Dict[tuple, Any] = {}
         self.llm = get_llm(self.config["llm"])
         self.memory = MemoryManager(self.llm, method=self.config.get("memory", "windowed"))
 
     # ----------------- Document Handling -----------------
     def build_knowledge_base(self, text: str):
-        """Chunk text, embed, and build vectorstore."""
-        chunks = get_chunker(self.config["chunking"], text)
-        # change: change the name to get_embeddings
-        embedding_model = get_embedding_model(self.config["embedding"])
-        self.vectorstore = build_vectorstore(self.config["vectordb"], chunks, embedding_model)
+        """
+        Attach a knowledge base for `text`.
+        Identical documents built with the same settings share one read-only
+        vectorstore through the KB registry; only a miss chunks and embeds.
+        """
+        key = make_kb_key(
+            text, self.config["chunking"], self.config["embedding"], self.config["vectordb"]
+        )
+        if key == self.kb_key:
+            return
+
+        def _build():
+            chunks = get_chunker(self.config["chunking"], text)
+            # change: change the name to get_embeddings
+            embedding_model = CachedQueryEmbeddings(
+                get_embedding_model(self.config["embedding"]),
+                maxsize=self.config["query_embedding_cache_size"],
+            )
+            return build_vectorstore(self.config["vectordb"], chunks, embedding_model)
+
+        vectorstore = self.kb_registry.acquire(key, _build)
+        self.release_knowledge_base()
+        self.vectorstore = vectorstore
+        self.kb_key = key
+
+    def release_knowledge_base(self):
+        """Detach from the shared knowledge base (call when the session ends)."""
+        if self.kb_key is not None:
+            self.kb_registry.release(self.kb_key)
+        self.vectorstore = None
+        self.kb_key = None
+        self._retrievers.clear()
+
+    def _get_retriever(self):
+        """Return the retriever for the current KB, building it once per KB version."""
+        key = (self.kb_key, self.config["retrieval"])
+        retriever = self._retrievers.get(key)
+        if retriever is None:
+            retriever = get_retriever(self.vectorstore, self.config["retrieval"])
+            self._retrievers[key] = retriever
+        return retriever
 
     # ----------------- Query Pipeline -----------------
-    def query(self, question: str) -> Dict[str, Any]:
-        """End-to-end RAG query."""
+    def query(self, question: str, retrieval_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        End-to-end RAG query.
+        Args:
+            question (str): User question
+            retrieval_params (dict): Optional per-request search overrides,
+                e.g. {"k": 3} or {"score_threshold": 0.5} (see retriever.RETRIEVAL_PARAMS)
+        """
         if not self.vectorstore:
             raise RuntimeError("Vectorstore not initialized. Call build_knowledge_base().")
 
+        search_overrides = get_search_overrides(self.config["retrieval"], retrieval_params)
+
         # Save user input
         self.memory.add_message("user", question)
 
         # Retrieval
-        retriever = get_retriever(self.vectorstore, self.config["retrieval"])
-        docs = retriever.invoke(question)
+        retriever = self._get_retriever()
+        docs = retriever.invoke(question, **search_overrides)
 
         # Reranker
         docs = apply_reranker(self.config, question, docs)
@@ -0,0 +1,87 @@
+"""
+kb_registry.py
+--------------
+Content-addressed registry of shared knowledge bases.
+Sessions that upload the same document with the same pipeline settings
+attach to one reference-counted vectorstore instead of rebuilding it.
+"""
+
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+KBKey = Tuple[str, str, str, str]
+
+
+def make_kb_key(text: str, chunking: str, embedding: str, vectordb: str) -> KBKey:
+    """
+    Build the content address of a knowledge base.
+    Args:
+        text (str): Raw document text
+        chunking (str): Chunking method
+        embedding (str): Embedding model
+        vectordb (str): Vectorstore backend
+    Returns:
+        (document sha256, chunking, embedding, vectordb)
+    """
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return (digest, chunking, embedding, vectordb)
+
+
+class KnowledgeBaseRegistry:
+    """
+    KnowledgeBaseRegistry
+    ---------------------
+    Maps KB keys to shared, read-only vectorstores with a reference count.
+    A vectorstore is dropped when its last session releases it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[KBKey, Dict[str, Any]] = {}
+
+    def acquire(self, key: KBKey, build_fn: Callable[[], Any]):
+        """
+        Return the vectorstore for `key`, building it with `build_fn` on a miss.
+        Every successful call must be paired with release(key).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["refcount"] += 1
+                return entry["vectorstore"]
+
+        # Build outside the lock so unrelated uploads are not serialized.
+        vectorstore = build_fn()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {"vectorstore": vectorstore, "refcount": 0}
+                self._entries[key] = entry
+            # If another session won the race, share its copy and drop ours.
+            entry["refcount"] += 1
+            return entry["vectorstore"]
+
+    def release(self, key: KBKey):
+        """Drop one reference; the vectorstore is freed when none remain."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry["refcount"] -= 1
+            if entry["refcount"] <= 0:
+                del self._entries[key]
+
+    def refcount(self, key: KBKey) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry["refcount"] if entry else 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Process-wide registry shared by all RAG sessions
+shared_kb_registry = KnowledgeBaseRegistry()
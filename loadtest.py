@@ -0,0 +1,303 @@
+"""
+loadtest.py
+-----------
+Concurrent HTTP load generator for the FastAPI service.
+Simulates users that open a session, upload a document (text or file)
+and chat with it, then reports throughput, per-route latency percentiles,
+error rates, event-loop lag and peak RSS.
+
+Usage:
+    python loadtest.py --users 200 --concurrency 50 --out results.json
+    python loadtest.py --serve 8000                 # offline server with fakes
+    python loadtest.py --url http://localhost:8000  # drive a running server
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.messages import AIMessage
+
+ROUTES = ["/session", "/upload-text", "/upload-file", "/chat"]
+
+SAMPLE_QUESTIONS = [
+    "What is this document about?",
+    "Summarize the main points.",
+    "Who is mentioned in the text?",
+    "What happened first?",
+    "Can you explain that in more detail?",
+]
+
+
+# ----------------- Offline stand-ins -----------------
+class FakeLLM:
+    """Minimal chat model stand-in; blocks for `latency` seconds like a sync API call."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def invoke(self, prompt):
+        if self.latency:
+            time.sleep(self.latency)
+        return AIMessage(content="I don't know based on the provided docs.")
+
+
+def install_fakes(llm_latency: float = 0.0, embedding_size: int = 384, vectordb: Optional[str] = None):
+    """Patch the engine to use fake LLM/embeddings so the app runs offline."""
+    import engine
+    import routes
+
+    engine.get_llm = lambda method: FakeLLM(llm_latency)
+    engine.get_embedding_model = lambda method: DeterministicFakeEmbedding(size=embedding_size)
+    if vectordb:
+        routes.DEFAULT_RAG_CONFIG["vectordb"] = vectordb
+
+
+# ----------------- Metrics -----------------
+def _current_rss_kb() -> int:
+    """Current resident set size in KB (Linux /proc, falls back to peak RSS)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() // 1024
+    except (OSError, IndexError, ValueError):
+        return _peak_rss_kb()
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KB on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def _summarize(latencies: List[float]) -> Dict[str, float]:
+    values = sorted(latencies)
+    return {
+        "mean_ms": round(statistics.fmean(values) * 1000, 2) if values else 0.0,
+        "p50_ms": round(_percentile(values, 50) * 1000, 2),
+        "p90_ms": round(_percentile(values, 90) * 1000, 2),
+        "p99_ms": round(_percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+class Recorder:
+    """Collects per-route latencies and errors."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {route: [] for route in ROUTES}
+        self.errors: Dict[str, int] = {route: 0 for route in ROUTES}
+        self.status_codes: Dict[str, Dict[str, int]] = {route: {} for route in ROUTES}
+
+    async def request(self, client: httpx.AsyncClient, route: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.post(route, **kwargs)
+        except httpx.HTTPError as e:
+            self.latencies[route].append(time.perf_counter() - start)
+            self.errors[route] += 1
+            codes = self.status_codes[route]
+            codes[type(e).__name__] = codes.get(type(e).__name__, 0) + 1
+            return None
+        self.latencies[route].append(time.perf_counter() - start)
+        codes = self.status_codes[route]
+        codes[str(response.status_code)] = codes.get(str(response.status_code), 0) + 1
+        if response.status_code >= 400:
+            self.errors[route] += 1
+        return response
+
+
+async def _monitor_event_loop(lags: List[float], rss_samples: List[int], stop: asyncio.Event, interval: float = 0.01):
+    """Record how late the loop wakes up; large values mean handlers block it."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - start - interval))
+        if len(lags) % 10 == 0:
+            rss_samples.append(_current_rss_kb())
+
+
+# ----------------- Scenario -----------------
+def _make_document(rng: random.Random, doc_id: int, paragraphs: int) -> str:
+    words = ["history", "science", "policy", "employee", "benefit", "market", "energy",
+             "system", "process", "report", "customer", "network", "quality", "design"]
+    lines = [f"Document {doc_id}"]
+    for p in range(paragraphs):
+        sentence = " ".join(rng.choice(words) for _ in range(60))
+        lines.append(f"Section {p}. {sentence}.")
+    return "\n\n".join(lines)
+
+
+async def _simulate_user(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    rng: random.Random,
+    documents: List[str],
+    args: argparse.Namespace,
+):
+    response = await recorder.request(client, "/session", json={"data": "loadtest"})
+    if response is None or response.status_code >= 400:
+        return
+    headers = {"x-user-id": response.json()["userId"]}
+
+    if rng.random() < args.shared_doc_ratio:
+        text = rng.choice(documents)
+    else:
+        text = _make_document(rng, rng.randrange(10**9), args.doc_paragraphs)
+
+    if rng.random() < args.file_upload_ratio:
+        files = {"file": ("doc.txt", text.encode("utf-8"), "text/plain")}
+        response = await recorder.request(client, "/upload-file", headers=headers, files=files)
+    else:
+        response = await recorder.request(client, "/upload-text", headers=headers, json={"text": text})
+    if response is None or response.status_code >= 400:
+        return
+
+    for _ in range(args.chats_per_user):
+        if args.think_time:
+            await asyncio.sleep(rng.uniform(0, args.think_time))
+        await recorder.request(client, "/chat", headers=headers, json={"question": rng.choice(SAMPLE_QUESTIONS)})
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the scenario and return the results dictionary."""
+    rng = random.Random(args.seed)
+    documents = [_make_document(rng, i, args.doc_paragraphs) for i in range(args.shared_docs)]
+
+    if args.url:
+        transport = None
+        base_url = args.url
+    else:
+        install_fakes(args.llm_latency, vectordb=args.vectordb)
+        from main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+
+    recorder = Recorder()
+    lags: List[float] = []
+    rss_samples: List[int] = []
+    stop = asyncio.Event()
+    rss_start = _current_rss_kb()
+    monitor = asyncio.create_task(_monitor_event_loop(lags, rss_samples, stop))
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def _bounded(user_rng: random.Random):
+        async with semaphore:
+            await _simulate_user(client, recorder, user_rng, documents, args)
+
+    start = time.perf_counter()
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout) as client:
+        await asyncio.gather(*[_bounded(random.Random(rng.random())) for _ in range(args.users)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+    rss_end = _current_rss_kb()
+
+    total_requests = sum(len(v) for v in recorder.latencies.values())
+    total_errors = sum(recorder.errors.values())
+    results = {
+        "config": {k: v for k, v in vars(args).items() if k != "serve"},
+        "mode": "http" if args.url else "in-process",
+        "duration_s": round(elapsed, 3),
+        "total_requests": total_requests,
+        "throughput_rps": round(total_requests / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(total_errors / total_requests, 4) if total_requests else 0.0,
+        "routes": {
+            route: {
+                "requests": len(recorder.latencies[route]),
+                "errors": recorder.errors[route],
+                "error_rate": round(recorder.errors[route] / len(recorder.latencies[route]), 4)
+                if recorder.latencies[route] else 0.0,
+                "status_codes": recorder.status_codes[route],
+                **_summarize(recorder.latencies[route]),
+            }
+            for route in ROUTES
+        },
+        "event_loop_lag": _summarize(lags),
+        "memory": {
+            "rss_start_kb": rss_start,
+            "rss_end_kb": rss_end,
+            "rss_peak_sampled_kb": max(rss_samples, default=rss_end),
+            "peak_rss_kb": _peak_rss_kb(),
+            "rss_growth_per_user_kb": round((rss_end - rss_start) / args.users, 2) if args.users else 0.0,
+        },
+    }
+    if args.url:
+        results["memory"]["note"] = "RSS is the load generator's, not the server's"
+    return results
+
+
+def _print_report(results: Dict[str, Any]):
+    print(f"\nMode: {results['mode']}  duration: {results['duration_s']}s  "
+          f"requests: {results['total_requests']}  throughput: {results['throughput_rps']} req/s  "
+          f"error rate: {results['error_rate']:.2%}")
+    print(f"{'route':<14}{'reqs':>7}{'errs':>7}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for route, stats in results["routes"].items():
+        print(f"{route:<14}{stats['requests']:>7}{stats['errors']:>7}{stats['p50_ms']:>10}"
+              f"{stats['p90_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}")
+    lag = results["event_loop_lag"]
+    print(f"event loop lag (ms): p50={lag['p50_ms']} p99={lag['p99_ms']} max={lag['max_ms']}")
+    mem = results["memory"]
+    print(f"RSS: start={mem['rss_start_kb']}KB end={mem['rss_end_kb']}KB peak={mem['peak_rss_kb']}KB "
+          f"growth/user={mem['rss_growth_per_user_kb']}KB")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the RAG FastAPI service")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process ASGI app)")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="Start the app with offline fakes on PORT instead of generating load")
+    parser.add_argument("--users", type=int, default=50, help="Simulated users")
+    parser.add_argument("--concurrency", type=int, default=10, help="Users active at once")
+    parser.add_argument("--chats-per-user", type=int, default=5)
+    parser.add_argument("--file-upload-ratio", type=float, default=0.3,
+                        help="Fraction of users uploading via /upload-file instead of /upload-text")
+    parser.add_argument("--shared-docs", type=int, default=5, help="Size of the popular-document pool")
+    parser.add_argument("--shared-doc-ratio", type=float, default=0.5,
+                        help="Fraction of users uploading a popular document")
+    parser.add_argument("--doc-paragraphs", type=int, default=20)
+    parser.add_argument("--think-time", type=float, default=0.0, help="Max seconds between chats")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake LLM blocking delay (s)")
+    parser.add_argument("--vectordb", help="Override DEFAULT_RAG_CONFIG['vectordb'] (offline modes)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Write results JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+
+    if args.serve:
+        import uvicorn
+        install_fakes(args.llm_latency, vectordb=args.vectordb)
+        from main import app
+        uvicorn.run(app, host="127.0.0.1", port=args.serve)
+        return
+
+    results = asyncio.run(run_load_test(args))
+    _print_report(results)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
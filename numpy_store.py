@@ -0,0 +1,343 @@
+"""
+numpy_store.py
+--------------
+In-process vector store backed by a NumPy matrix.
+Exact cosine search with no external index or service.
+"""
+
+import json
+import os
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows of a 2D float32 matrix (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    NumpyVectorStore
+    ----------------
+    Stores normalized float32 embeddings in a contiguous, growable array.
+    Search is one matrix multiply followed by argpartition, so small and
+    medium corpora are searched exactly without FAISS/Chroma/Pinecone.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    DOCSTORE_FILE = "docstore.json"
+
+    def __init__(self, embedding: Embeddings, initial_capacity: int = 256):
+        self.embedding = embedding
+        self._vectors: Optional[np.ndarray] = None
+        self._initial_capacity = max(1, initial_capacity)
+        self._size = 0
+        self._texts: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._ids: List[str] = []
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ----------------- Storage -----------------
+    @property
+    def _matrix(self) -> np.ndarray:
+        """View of the filled rows of the vector buffer."""
+        if self._vectors is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._vectors[: self._size]
+
+    def _reserve(self, extra: int, dim: int):
+        """Grow the buffer (by doubling) so it can hold `extra` more rows."""
+        if self._vectors is None:
+            capacity = max(self._initial_capacity, extra)
+            self._vectors = np.empty((capacity, dim), dtype=np.float32)
+            return
+        if self._vectors.shape[1] != dim:
+            raise ValueError(
+                f"Embedding dimension mismatch: store has {self._vectors.shape[1]}, got {dim}"
+            )
+        needed = self._size + extra
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        grown = np.empty((capacity, dim), dtype=np.float32)
+        grown[: self._size] = self._vectors[: self._size]
+        self._vectors = grown
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: Iterable[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Append precomputed embeddings with their texts."""
+        vectors = np.asarray(list(embeddings), dtype=np.float32)
+        if len(texts) == 0:
+            return []
+        if vectors.ndim != 2 or vectors.shape[0] != len(texts):
+            raise ValueError("Number of embeddings must match number of texts")
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        if len(metadatas) != len(texts) or len(ids) != len(texts):
+            raise ValueError("metadatas and ids must match the number of texts")
+
+        self._reserve(len(texts), vectors.shape[1])
+        self._vectors[self._size : self._size + len(texts)] = _normalize(vectors)
+        self._size += len(texts)
+        self._texts.extend(texts)
+        self._metadatas.extend(dict(m) for m in metadatas)
+        self._ids.extend(ids)
+        return list(ids)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Embed texts and append them to the store."""
+        texts = list(texts)
+        if not texts:
+            return []
+        embeddings = self.embedding.embed_documents(texts)
+        return self.add_embeddings(texts, embeddings, metadatas=metadatas, ids=ids)
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        """Build a store from raw texts."""
+        store = cls(embedding, initial_capacity=max(len(texts), 1))
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+    # ----------------- Search -----------------
+    def _filter_mask(self, filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Boolean mask of rows whose metadata matches every key in `filter`."""
+        if not filter:
+            return None
+        return np.fromiter(
+            (all(meta.get(key) == value for key, value in filter.items()) for meta in self._metadatas),
+            dtype=bool,
+            count=self._size,
+        )
+
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        vectors = [self.embedding.embed_query(q) for q in queries]
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+    def _top_k(
+        self,
+        query_vectors: np.ndarray,
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact top-k search for a batch of normalized query vectors.
+        Returns:
+            (indices, scores), both shaped (n_queries, k'), best first.
+        """
+        n_queries = query_vectors.shape[0]
+        if self._size == 0 or k <= 0:
+            return np.empty((n_queries, 0), dtype=np.int64), np.empty((n_queries, 0), dtype=np.float32)
+
+        scores = query_vectors @ self._matrix.T
+        mask = self._filter_mask(filter)
+        if mask is not None:
+            scores[:, ~mask] = -np.inf
+            k = min(k, int(mask.sum()))
+        k = min(k, self._size)
+        if k == 0:
+            return np.empty((n_queries, 0), dtype=np.int64), np.empty((n_queries, 0), dtype=np.float32)
+
+        if k < self._size:
+            part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            part = np.broadcast_to(np.arange(self._size), (n_queries, self._size))
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        order = np.argsort(-part_scores, axis=1)
+        return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+    def _to_document(self, idx: int) -> Document:
+        return Document(page_content=self._texts[idx], metadata=dict(self._metadatas[idx]), id=self._ids[idx])
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        query = _normalize(np.asarray([embedding], dtype=np.float32))
+        indices, scores = self._top_k(query, k, filter)
+        return [(self._to_document(int(i)), float(s)) for i, s in zip(indices[0], scores[0])]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        """Return docs with cosine similarity scores (higher is better)."""
+        return self.similarity_search_with_score_by_vector(
+            self.embedding.embed_query(query), k=k, filter=filter
+        )
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, filter)]
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def batch_similarity_search_with_score(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """Search many queries with a single matrix multiply."""
+        if not queries:
+            return []
+        indices, scores = self._top_k(self._embed_queries(queries), k, filter)
+        return [
+            [(self._to_document(int(i)), float(s)) for i, s in zip(row_idx, row_scores)]
+            for row_idx, row_scores in zip(indices, scores)
+        ]
+
+    def batch_similarity_search(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Document]]:
+        return [
+            [doc for doc, _ in hits]
+            for hits in self.batch_similarity_search_with_score(queries, k, filter)
+        ]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Scores are already cosine similarities of normalized vectors.
+        return lambda score: score
+
+    # ----------------- MMR -----------------
+    def max_marginal_relevance_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        """
+        Maximal marginal relevance over the top `fetch_k` candidates.
+        The max-similarity-to-selected vector is updated in one NumPy op
+        per pick instead of recomputing all pairwise similarities.
+        """
+        query = _normalize(np.asarray([embedding], dtype=np.float32))
+        indices, scores = self._top_k(query, max(fetch_k, k), filter)
+        candidates, query_sims = indices[0], scores[0]
+        if len(candidates) == 0:
+            return []
+
+        cand_vectors = self._matrix[candidates]
+        pairwise = cand_vectors @ cand_vectors.T
+        max_sim_to_selected = np.full(len(candidates), -np.inf, dtype=np.float32)
+        available = np.ones(len(candidates), dtype=bool)
+        selected: List[int] = []
+
+        # Best match is always first (candidates are sorted by similarity).
+        pick = 0
+        for _ in range(min(k, len(candidates))):
+            selected.append(pick)
+            available[pick] = False
+            np.maximum(max_sim_to_selected, pairwise[:, pick], out=max_sim_to_selected)
+            if not available.any():
+                break
+            mmr = lambda_mult * query_sims - (1 - lambda_mult) * max_sim_to_selected
+            mmr[~available] = -np.inf
+            pick = int(np.argmax(mmr))
+
+        return [self._to_document(int(candidates[i])) for i in selected[:k]]
+
+    def max_marginal_relevance_search(
+        self,
+        query: str,
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return self.max_marginal_relevance_search_by_vector(
+            self.embedding.embed_query(query),
+            k=k,
+            fetch_k=fetch_k,
+            lambda_mult=lambda_mult,
+            filter=filter,
+        )
+
+    # ----------------- Persistence -----------------
+    def save_local(self, folder_path: str):
+        """Save vectors as .npy and texts/metadata/ids as JSON."""
+        os.makedirs(folder_path, exist_ok=True)
+        np.save(os.path.join(folder_path, self.VECTORS_FILE), np.ascontiguousarray(self._matrix))
+        with open(os.path.join(folder_path, self.DOCSTORE_FILE), "w", encoding="utf-8") as f:
+            json.dump(
+                {"texts": self._texts, "metadatas": self._metadatas, "ids": self._ids},
+                f,
+                ensure_ascii=False,
+            )
+
+    @classmethod
+    def load_local(cls, folder_path: str, embedding: Embeddings) -> "NumpyVectorStore":
+        """Load a store previously written by save_local()."""
+        vectors = np.load(os.path.join(folder_path, cls.VECTORS_FILE), allow_pickle=False)
+        with open(os.path.join(folder_path, cls.DOCSTORE_FILE), encoding="utf-8") as f:
+            docstore = json.load(f)
+
+        store = cls(embedding, initial_capacity=max(len(docstore["texts"]), 1))
+        if len(docstore["texts"]):
+            # Vectors were normalized before saving; copy straight into the buffer.
+            store._reserve(vectors.shape[0], vectors.shape[1])
+            store._vectors[: vectors.shape[0]] = vectors
+            store._size = vectors.shape[0]
+            store._texts = list(docstore["texts"])
+            store._metadatas = list(docstore["metadatas"])
+            store._ids = list(docstore["ids"])
+        return store
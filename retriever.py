@@ -31,3 +31,32 @@ def get_retriever(vectorstore, method: str):
 
     else:
         raise ValueError(f"Unsupported retrieval strategy: {method}")
+
+
+# Search parameters that may be overridden per request, by strategy
+RETRIEVAL_PARAMS = {
+    "topk": {"k"},
+    "mmr": {"k", "fetch_k", "lambda_mult"},
+    "hybrid": {"k", "score_threshold"},
+}
+
+
+def get_search_overrides(method: str, params):
+    """
+    Validate per-request search parameters for a retrieval strategy.
+    Args:
+        method (str): "topk" | "mmr" | "hybrid"
+        params (dict | None): e.g. {"k": 3, "score_threshold": 0.5}
+    Returns:
+        Dict of search kwargs to pass to retriever.invoke()
+    """
+    if method not in RETRIEVAL_PARAMS:
+        raise ValueError(f"Unsupported retrieval strategy: {method}")
+
+    overrides = {key: value for key, value in (params or {}).items() if value is not None}
+    unsupported = set(overrides) - RETRIEVAL_PARAMS[method]
+    if unsupported:
+        raise ValueError(
+            f"Unsupported parameters for '{method}' retrieval: {', '.join(sorted(unsupported))}"
+        )
+    return overrides
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Header, HTTPException, UploadFile, File
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import uuid
 import time
 import asyncio
 import contextlib
 from typing import Any, Dict, Optional
 from engine import RAGEngine
+from retriever import get_search_overrides
 
 router = APIRouter()
 
@@ -33,7 +34,10 @@ async def _cleanup_expired_sessions() -> None:
         for user_id in expired_user_ids:
             user_data_store.pop(user_id, None)
             # Also clean up RAG sessions for expired users
-            rag_sessions.pop(user_id, None)
+            rag = rag_sessions.pop(user_id, None)
+            if rag is not None:
+                # Drop this session's reference to its shared knowledge base
+                rag.release_knowledge_base()
         await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
 
 @router.on_event("startup")
@@ -66,6 +70,11 @@ class SessionRequest(BaseModel):
 
 class ChatRequest(BaseModel):
     question: str
+    # Optional per-request retrieval overrides
+    k: Optional[int] = Field(None, ge=1)
+    fetch_k: Optional[int] = Field(None, ge=1)
+    lambda_mult: Optional[float] = Field(None, ge=0, le=1)
+    score_threshold: Optional[float] = None
 
 class UploadTextRequest(BaseModel):
     text: str
@@ -150,7 +159,18 @@ async def chat_with_doc(request: ChatRequest, x_user_id: Optional[str] = Header(
         raise HTTPException(status_code=409, detail="No knowledge base found. Upload a document first.")
 
     rag = rag_sessions[x_user_id]
-    result = rag.query(request.question)
+    retrieval_params = {
+        "k": request.k,
+        "fetch_k": request.fetch_k,
+        "lambda_mult": request.lambda_mult,
+        "score_threshold": request.score_threshold,
+    }
+    try:
+        get_search_overrides(rag.config["retrieval"], retrieval_params)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    result = rag.query(request.question, retrieval_params)
 
     return {
         "userId": x_user_id,
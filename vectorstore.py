@@ -2,17 +2,18 @@
 vectorstore.py
 --------------
 Vector store builder for RAG.
-Supports FAISS, Chroma, Pinecone.
+Supports FAISS, Chroma, Pinecone, and a built-in NumPy store.
 """
 
 from langchain_community.vectorstores import FAISS, Chroma, Pinecone
+from numpy_store import NumpyVectorStore
 
 
 def build_vectorstore(method: str, chunks, embedding_model):
     """
     Build vectorstore based on chosen backend.
     Args:
-        method (str): "faiss" | "chroma" | "pinecone"
+        method (str): "faiss" | "chroma" | "pinecone" | "numpy"
         chunks (List[str]): Preprocessed text chunks
         embeddings: Embedding model
     Returns:
@@ -31,5 +32,8 @@ def build_vectorstore(method: str, chunks, embedding_model):
             chunks, embedding_model, index_name="rag-prototype"
         )
 
+    elif method == "numpy":
+        return NumpyVectorStore.from_texts(chunks, embedding_model)
+
     else:
         raise ValueError(f"Unsupported vector DB: {method}")